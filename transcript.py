@@ -1,12 +1,15 @@
 #!/usr/bin/env python3
 """Jednoduchý transkriptor M4A na slovenský text - všetko lokálne."""
 
+import bisect
+import contextlib
 import os
 import re
 import subprocess
 import sys
 import tempfile
 import time
+import wave
 import platform
 import importlib.util
 import argparse
@@ -16,19 +19,140 @@ from tkinter import filedialog, messagebox
 from pathlib import Path
 import json
 
-def text_do_markdown(text: str) -> str:
-    """Konvertuje transkript do prehľadného Markdown formátu."""
-    if not text.strip():
-        return "# Transkript\n\n*(prázdne)*"
-    # Formát "Hovoriaci 1: text" -> ## Hovoriaci 1\n\ntext
-    bloky = []
-    for blok in text.strip().split("\n\n"):
-        m = re.match(r"^(Hovoriaci \d+):\s*(.*)$", blok, re.DOTALL)
-        if m:
-            bloky.append(f"## {m.group(1)}\n\n{m.group(2).strip()}")
-        else:
-            bloky.append(blok)
-    return "# Transkript\n\n" + "\n\n".join(bloky)
+FORMÁTY = ("txt", "md", "srt", "vtt", "jsonl")
+
+
+def _čas_titulkov(sekundy, oddeľovač=","):
+    """Formát HH:MM:SS,mmm (SRT) alebo HH:MM:SS.mmm (VTT)."""
+    ms = int(round(max(0.0, sekundy) * 1000))
+    h, ms = divmod(ms, 3_600_000)
+    m, ms = divmod(ms, 60_000)
+    s, ms = divmod(ms, 1000)
+    return f"{h:02d}:{m:02d}:{s:02d}{oddeľovač}{ms:03d}"
+
+
+def cesty_exportu(base, formáty=FORMÁTY):
+    """Vráti {formát: cesta} pre súbory vedľa seba s menom base."""
+    base = Path(base)
+    return {f: base.parent / f"{base.name}.{f}" for f in FORMÁTY if f in formáty}
+
+
+def exportuj(segmenty, cesty, poznámka=None):
+    """Jedným prechodom zapíše segmenty do formátov z cesty ({formát: cesta}).
+
+    Segmenty sú slovníky so start, end, text a voliteľne hovoriaci. Spracúvajú sa
+    priebežne, takže pamäť nezávisí od dĺžky transkriptu. Každý formát sa píše do
+    dočasného súboru a cieľ sa nahradí až po úspešnom prechode. Vráti cesty.
+    """
+    dočasné = {}
+    try:
+        with contextlib.ExitStack() as stack:
+            súbory = {}
+            for f, c in cesty.items():
+                # Vedľa cieľa, aby os.replace bol atomický v rámci jedného disku
+                dočasné[f] = Path(c).with_name(f".{Path(c).name}.{os.getpid()}.tmp")
+                súbory[f] = stack.enter_context(open(dočasné[f], "w", encoding="utf-8"))
+            txt, md, srt, vtt, js = (súbory.get(f) for f in FORMÁTY)
+            if md:
+                md.write("# Transkript")
+            if vtt:
+                vtt.write("WEBVTT\n")
+            if js:
+                # JSON Lines: metadáta na prvom riadku, potom jeden segment na riadok
+                js.write(json.dumps({"verzia": 1, "poznámka": poznámka}, ensure_ascii=False) + "\n")
+
+            počet = 0
+            predošlý = None
+            for seg in segmenty:
+                text = (seg.get("text") or "").strip()
+                if not text:
+                    continue
+                hov = seg.get("hovoriaci")
+                start = seg.get("start", 0.0)
+                end = seg.get("end", start + 1)
+                # Po sebe idúce segmenty rovnakého rečníka tvoria jeden odsek
+                nový_blok = počet == 0 or hov != predošlý
+
+                if txt:
+                    if nový_blok:
+                        txt.write(("\n\n" if počet else "") + (f"{hov}: " if hov else ""))
+                    else:
+                        txt.write(" ")
+                    txt.write(text)
+                if md:
+                    if nový_blok:
+                        md.write(f"\n\n## {hov}\n\n" if hov else "\n\n")
+                    else:
+                        md.write(" ")
+                    md.write(text)
+                if srt:
+                    srt.write(
+                        f"{počet + 1}\n{_čas_titulkov(start)} --> {_čas_titulkov(end)}\n"
+                        f"{f'{hov}: ' if hov else ''}{text}\n\n"
+                    )
+                if vtt:
+                    vtt.write(
+                        f"\n{_čas_titulkov(start, '.')} --> {_čas_titulkov(end, '.')}\n"
+                        f"{f'<v {hov}>' if hov else ''}{text}\n"
+                    )
+                if js:
+                    záznam = {"start": round(start, 3), "end": round(end, 3), "hovoriaci": hov, "text": text}
+                    js.write(json.dumps(záznam, ensure_ascii=False) + "\n")
+
+                počet += 1
+                predošlý = hov
+
+            if md and not počet:
+                md.write("\n\n*(prázdne)*")
+            if poznámka:
+                if txt:
+                    txt.write(f"\n\n(Pozn.: {poznámka})")
+                if md:
+                    md.write(f"\n\n*(Pozn.: {poznámka})*")
+            if md:
+                md.write("\n")
+    except BaseException:
+        for tmp in dočasné.values():
+            with contextlib.suppress(OSError):
+                os.unlink(tmp)
+        raise
+    for f, tmp in dočasné.items():
+        os.replace(tmp, cesty[f])
+    return cesty
+
+
+def _záznamy_exportu(cesta):
+    """Číta riadky JSON Lines exportu ako slovníky; prvý musí byť hlavička."""
+    with open(cesta, encoding="utf-8") as f:
+        hlavička = True
+        for číslo, riadok in enumerate(f, start=1):
+            riadok = riadok.strip()
+            if not riadok:
+                continue
+            try:
+                záznam = json.loads(riadok)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{cesta}:{číslo}: neplatný riadok ({e.msg})") from e
+            if not isinstance(záznam, dict) or (hlavička and "verzia" not in záznam):
+                raise ValueError(f"{cesta}:{číslo}: neočakávaný obsah, nie je to export segmentov.")
+            hlavička = False
+            yield záznam
+
+
+def načítaj_poznámku(cesta):
+    """Vráti poznámku (napr. o zlyhaní diarizácie) z hlavičky exportu."""
+    hlavička = next(_záznamy_exportu(cesta), None)
+    if hlavička is None:
+        raise ValueError(f"{cesta} je prázdny.")
+    return hlavička.get("poznámka")
+
+
+def načítaj_segmenty(cesta):
+    """Postupne číta segmenty z .jsonl exportu, bez načítania celého súboru do pamäte."""
+    záznamy = _záznamy_exportu(cesta)
+    if next(záznamy, None) is None:
+        raise ValueError(f"{cesta} je prázdny.")
+    yield from záznamy
 
 
 def dĺžka_audia(súbor):
@@ -45,6 +169,127 @@ def dĺžka_audia(súbor):
         return None
 
 
+def nájdi_reč(súbor, prah_db=-35.0, min_ticho=1.0, okraj=0.25):
+    """Nájde úseky reči cez ffmpeg silencedetect (lacno, na CPU).
+
+    Vráti (úseky, dĺžka), kde úseky sú (start, end) v sekundách pôvodného audia.
+    Pásmový filter 200–3500 Hz potlačí hukot a časť hudby mimo pásma reči.
+    """
+    ffmpeg_bin, _ = over_ffmpeg()
+    dĺžka = dĺžka_audia(súbor)
+    if not dĺžka:
+        return None, None
+    out = subprocess.run(
+        [ffmpeg_bin, "-hide_banner", "-nostats", "-i", str(súbor), "-vn",
+         "-af", f"highpass=f=200,lowpass=f=3500,silencedetect=noise={prah_db}dB:d={min_ticho}",
+         "-f", "null", "-"],
+        capture_output=True, text=True, check=True
+    )
+
+    ticho = []
+    začiatok = None
+    for riadok in out.stderr.splitlines():
+        m = re.search(r"silence_start: ([-\d.eE+]+)", riadok)
+        if m:
+            začiatok = max(0.0, float(m.group(1)))
+            continue
+        m = re.search(r"silence_end: ([-\d.eE+]+)", riadok)
+        if m and začiatok is not None:
+            ticho.append((začiatok, float(m.group(1))))
+            začiatok = None
+    if začiatok is not None:
+        ticho.append((začiatok, dĺžka))
+
+    # Reč = doplnok ticha, rozšírený o okraj, aby sa neorezávali začiatky slov
+    úseky = []
+    kurzor = 0.0
+    for t_start, t_end in ticho + [(dĺžka, dĺžka)]:
+        if t_start > kurzor:
+            s, e = max(0.0, kurzor - okraj), min(dĺžka, t_start + okraj)
+            if úseky and s <= úseky[-1][1]:
+                úseky[-1] = (úseky[-1][0], max(úseky[-1][1], e))
+            else:
+                úseky.append((s, e))
+        kurzor = max(kurzor, t_end)
+    return úseky, dĺžka
+
+
+def vystrihni_reč(súbor, úseky, vzorkovanie=16000):
+    """Poskladá úseky reči do dočasného 16 kHz mono WAV.
+
+    Strihá sa po vzorkách, nie po rámcoch dekodéra, aby časová mapa sedela aj
+    pri stovkách úsekov. Vráti (cesta, úseky) so skutočne zapísanými úsekmi.
+    """
+    ffmpeg_bin, _ = over_ffmpeg()
+    hranice = [(round(s * vzorkovanie), round(e * vzorkovanie)) for s, e in úseky]
+    zapísané = [0] * len(hranice)
+    wav = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
+    wav.close()
+    proc = subprocess.Popen(
+        [ffmpeg_bin, "-hide_banner", "-nostats", "-loglevel", "error",
+         "-i", str(súbor), "-vn", "-ac", "1", "-ar", str(vzorkovanie), "-f", "s16le", "-"],
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+    )
+    try:
+        with wave.open(wav.name, "wb") as out:
+            out.setnchannels(1)
+            out.setsampwidth(2)
+            out.setframerate(vzorkovanie)
+            pozícia, i, zvyšok = 0, 0, b""
+            while i < len(hranice):
+                blok = proc.stdout.read(1 << 16)
+                if not blok:
+                    break
+                dáta = zvyšok + blok
+                n = len(dáta) // 2
+                zvyšok = dáta[2 * n:]
+                while i < len(hranice):
+                    s, e = hranice[i]
+                    a, b = max(s, pozícia), min(e, pozícia + n)
+                    if a < b:
+                        out.writeframes(dáta[2 * (a - pozícia):2 * (b - pozícia)])
+                        zapísané[i] += b - a
+                    if e > pozícia + n:
+                        break
+                    i += 1
+                pozícia += n
+        hotovo = i == len(hranice)
+        if hotovo and proc.poll() is None:
+            proc.terminate()
+        proc.stdout.close()
+        proc.wait()
+        if not hotovo and proc.returncode != 0:
+            raise subprocess.CalledProcessError(proc.returncode, ffmpeg_bin)
+    except Exception:
+        if proc.poll() is None:
+            proc.kill()
+        os.unlink(wav.name)
+        raise
+    skutočné = [(s / vzorkovanie, (s + k) / vzorkovanie) for (s, _), k in zip(hranice, zapísané) if k]
+    return wav.name, skutočné
+
+
+def časová_mapa(úseky):
+    """Vráti funkciu, ktorá prevedie čas v orezanom audiu na čas v pôvodnom."""
+    začiatky, tabuľka = [], []
+    orezaný = 0.0
+    for s, e in úseky:
+        začiatky.append(orezaný)
+        tabuľka.append((orezaný, s, e - s))
+        orezaný += e - s
+
+    def mapuj(t, koniec=False):
+        """S koniec=True zostane čas presne na spoji v predošlom úseku."""
+        if not tabuľka:
+            return t
+        hľadaj = bisect.bisect_left if koniec else bisect.bisect_right
+        i = max(0, hľadaj(začiatky, t) - 1)
+        orez_start, pôvodný_start, trvanie = tabuľka[i]
+        return pôvodný_start + min(max(0.0, t - orez_start), trvanie)
+
+    return mapuj
+
+
 def priprav_path_pre_ffmpeg():
     """Doplní bežné macOS cesty, kde býva Homebrew FFmpeg."""
     kandidáti = ["/opt/homebrew/bin", "/usr/local/bin", "/opt/local/bin"]
@@ -169,105 +414,219 @@ def transkribuj(
     backend="auto",
     jazyk="auto",
     preložiť_do_en=False,
+    orezať_ticho=False,
 ):
-    """Transkribuje audio súbor do slovenčiny. S rečníkmi = formát Hovoriaci 1/2."""
+    """Transkribuje audio súbor do slovenčiny. S rečníkmi = formát Hovoriaci 1/2.
+
+    S orezať_ticho sa ASR aj diarizácia spustia len na úsekoch reči a časy
+    segmentov sa prepočítajú späť na pôvodnú časovú os. Vráti (segmenty, backend,
+    orezanie, poznámka): segmenty sú slovníky start/end/text/hovoriaci pre exportuj,
+    orezanie je štatistika alebo None, poznámka popis zlyhania diarizácie alebo None.
+    """
     over_ffmpeg()
     backend = zvoľ_backend(backend)
 
-    výsledok = None
-    segments = []
-
-    # Preferujeme MLX na Apple Silicon (zvyčajne najrýchlejšie na M1/M2/M3).
-    if backend == "mlx":
+    zdroj = str(súbor)
+    orezaný_súbor = None
+    orezanie = None
+    mapuj = None
+    if orezať_ticho:
+        t0 = time.time()
         try:
-            import mlx_whisper  # type: ignore
-            výsledok = mlx_whisper.transcribe(
-                str(súbor),
-                path_or_hf_repo=_mlx_model_name(model_názov),
-                language="sk",
-            )
-            segments = výsledok.get("segments", [])
+            úseky, dĺžka = nájdi_reč(súbor)
         except Exception:
-            backend = "mps" if "mps" in dostupné_backendy() else "cpu"
-
-    import torch
-    import whisper
-
-    if výsledok is None:
-        device = backend if backend in {"mps", "cuda", "cpu"} else "cpu"
-        if device == "cpu":
-            torch.set_num_threads(max(1, (os.cpu_count() or 1) - 1))
-        model = whisper.load_model(model_názov, device=device)
-        params = {}
-        if jazyk and jazyk != "auto":
-            params["language"] = jazyk
-        if preložiť_do_en:
-            params["task"] = "translate"
-        výsledok = model.transcribe(str(súbor), **params)
-        segments = výsledok.get("segments", [])
-    text = (výsledok.get("text") or "").strip()
-
-    if s_rečníkmi and segments and hf_token:
-        try:
-            priprav_pyannote_assets()
-            from pyannote.audio import Pipeline
-            pipeline = Pipeline.from_pretrained(
-                "pyannote/speaker-diarization-community-1",
-                token=hf_token
-            )
-            # Pyannote na MPS niekedy produkuje NaN; používame CPU pre stabilitu
-            import torch  # type: ignore
-            pipeline.to(torch.device("cpu"))
-            diarization = pipeline(str(súbor))
-
-            # Zoznam (start, end, speaker) z pyannote
-            speaker_segments = []
-            ann = getattr(diarization, "speaker_diarization", diarization)
-            for segment, _, speaker in ann.itertracks(yield_label=True):
-                speaker_segments.append((segment.start, segment.end, speaker))
-
-            def speaker_pre_segment(seg_start, seg_end):
-                best_speaker, best_overlap = None, 0
-                for spk_start, spk_end, speaker in speaker_segments:
-                    overlap = max(0, min(seg_end, spk_end) - max(seg_start, spk_start))
-                    if overlap > best_overlap:
-                        best_overlap, best_speaker = overlap, speaker
-                return best_speaker
-
-            # Mapovanie SPEAKER_00 -> Hovoriaci 1
-            speaker_map = {}
-            riadky = []
-            for seg in segments:
-                seg_start = seg.get("start", 0)
-                seg_end = seg.get("end", seg_start + 1)
-                seg_text = (seg.get("text") or "").strip()
-                if not seg_text:
-                    continue
-                spk = speaker_pre_segment(seg_start, seg_end) or "SPEAKER_00"
-                if spk not in speaker_map:
-                    speaker_map[spk] = f"Hovoriaci {len(speaker_map) + 1}"
-                hovoriaci = speaker_map[spk]
-                riadky.append((hovoriaci, seg_text))
-
-            # Zlúčiť po sebe idúcich rovnakých rečníkov
-            výstup = []
-            predošlý = None
-            for hov, txt in riadky:
-                if hov == predošlý:
-                    výstup[-1] = (hov, výstup[-1][1] + " " + txt)
-                else:
-                    výstup.append((hov, txt))
-                    predošlý = hov
+            # Detekcia ticha je len optimalizácia; pri chybe spracujeme celé audio
+            úseky, dĺžka = None, dĺžka_audia(súbor)
+        reč = sum(e - s for s, e in úseky) if úseky else 0.0
+        # Bez reči by si Whisper text len vymyslel, ASR aj diarizáciu vynecháme
+        bez_reči = úseky == [] and bool(dĺžka)
+        # Pri zanedbateľnom tichu sa orezanie neoplatí (strih + nový WAV)
+        if úseky and dĺžka and reč < dĺžka * 0.95:
+            try:
+                orezaný_súbor, úseky = vystrihni_reč(súbor, úseky)
+            except Exception:
+                # Aj strih je len optimalizácia; pri chybe spracujeme celé audio
+                úseky = None
+            if úseky:
+                reč = sum(e - s for s, e in úseky)
+                zdroj = orezaný_súbor
+                mapuj = časová_mapa(úseky)
+            elif orezaný_súbor:
+                os.unlink(orezaný_súbor)
+                orezaný_súbor = None
+        orezanie = {
+            "dĺžka": dĺžka or 0.0,
+            "reč": reč if mapuj else (0.0 if bez_reči else dĺžka or 0.0),
+            "preskočené": (dĺžka - reč) if mapuj else (dĺžka if bez_reči else 0.0),
+            "úseky": len(úseky or []),
+            "predspracovanie": time.time() - t0,
+        }
+        if bez_reči:
+            # Ušetrený čas sa bez dekódovania odhadnúť nedá
+            orezanie["ušetrené"] = None
+            return [], backend, orezanie, None
 
-            text = "\n\n".join(f"{h}: {t}" for h, t in výstup)
-        except Exception as e:
-            text = (výsledok.get("text") or "").strip() + f"\n\n(Pozn.: Rozpoznávanie rečníkov zlyhalo: {e})"
+    try:
+        # Len čas samotného dekódovania a diarizácie (bez načítania modelov),
+        # ktorý rastie s dĺžkou spracovaného audia
+        dekódovanie = 0.0
+        výsledok = None
+        segments = []
+
+        # Preferujeme MLX na Apple Silicon (zvyčajne najrýchlejšie na M1/M2/M3).
+        if backend == "mlx":
+            try:
+                import mlx_whisper  # type: ignore
+                if mapuj:
+                    # mlx_whisper načíta model až v transcribe(); vopred ho
+                    # nahráme do cache, aby sa nezapočítal do merania
+                    try:
+                        import mlx.core as mx  # type: ignore
+                        from mlx_whisper.transcribe import ModelHolder  # type: ignore
+                        ModelHolder.get_model(_mlx_model_name(model_názov), mx.float16)
+                    except Exception:
+                        pass
+                t0 = time.time()
+                výsledok = mlx_whisper.transcribe(
+                    zdroj,
+                    path_or_hf_repo=_mlx_model_name(model_názov),
+                    language="sk",
+                )
+                dekódovanie += time.time() - t0
+                segments = výsledok.get("segments", [])
+            except Exception:
+                backend = "mps" if "mps" in dostupné_backendy() else "cpu"
+
+        import torch
+        import whisper
+
+        if výsledok is None:
+            device = backend if backend in {"mps", "cuda", "cpu"} else "cpu"
+            if device == "cpu":
+                torch.set_num_threads(max(1, (os.cpu_count() or 1) - 1))
+            model = whisper.load_model(model_názov, device=device)
+            params = {}
+            if jazyk and jazyk != "auto":
+                params["language"] = jazyk
+            if preložiť_do_en:
+                params["task"] = "translate"
+            t0 = time.time()
+            výsledok = model.transcribe(zdroj, **params)
+            dekódovanie += time.time() - t0
+            segments = výsledok.get("segments", [])
+
+        segmenty = []
+        for seg in segments:
+            seg_start = seg.get("start", 0)
+            seg_end = seg.get("end", seg_start + 1)
+            if mapuj:
+                seg_start, seg_end = mapuj(seg_start), mapuj(seg_end, koniec=True)
+                # Segment nulovej dĺžky presne na spoji by inak skončil pred začiatkom
+                seg_end = max(seg_end, seg_start)
+            segmenty.append({
+                "start": seg_start,
+                "end": seg_end,
+                "text": (seg.get("text") or "").strip(),
+                "hovoriaci": None,
+            })
+        poznámka = None
+
+        if s_rečníkmi and segmenty and hf_token:
+            try:
+                priprav_pyannote_assets()
+                from pyannote.audio import Pipeline
+                pipeline = Pipeline.from_pretrained(
+                    "pyannote/speaker-diarization-community-1",
+                    token=hf_token
+                )
+                # Pyannote na MPS niekedy produkuje NaN; používame CPU pre stabilitu
+                import torch  # type: ignore
+                pipeline.to(torch.device("cpu"))
+                t0 = time.time()
+                diarization = pipeline(zdroj)
+                dekódovanie += time.time() - t0
+
+                # Zoznam (start, end, speaker) z pyannote
+                speaker_segments = []
+                ann = getattr(diarization, "speaker_diarization", diarization)
+                for segment, _, speaker in ann.itertracks(yield_label=True):
+                    if mapuj:
+                        spk_start = mapuj(segment.start)
+                        spk_end = max(mapuj(segment.end, koniec=True), spk_start)
+                        speaker_segments.append((spk_start, spk_end, speaker))
+                    else:
+                        speaker_segments.append((segment.start, segment.end, speaker))
+
+                def speaker_pre_segment(seg_start, seg_end):
+                    best_speaker, best_overlap = None, 0
+                    for spk_start, spk_end, speaker in speaker_segments:
+                        overlap = max(0, min(seg_end, spk_end) - max(seg_start, spk_start))
+                        if overlap > best_overlap:
+                            best_overlap, best_speaker = overlap, speaker
+                    return best_speaker
+
+                # Mapovanie SPEAKER_00 -> Hovoriaci 1 (zlúčenie odsekov robí exportuj)
+                speaker_map = {}
+                for seg in segmenty:
+                    if not seg["text"]:
+                        continue
+                    spk = speaker_pre_segment(seg["start"], seg["end"]) or "SPEAKER_00"
+                    if spk not in speaker_map:
+                        speaker_map[spk] = f"Hovoriaci {len(speaker_map) + 1}"
+                    seg["hovoriaci"] = speaker_map[spk]
+            except Exception as e:
+                for seg in segmenty:
+                    seg["hovoriaci"] = None
+                poznámka = f"Rozpoznávanie rečníkov zlyhalo: {e}"
+
+        if orezanie and mapuj:
+            # Odhad: dekódovanie škáluje lineárne s dĺžkou spracovaného audia
+            plné = dekódovanie * orezanie["dĺžka"] / orezanie["reč"] if orezanie["reč"] else dekódovanie
+            orezanie["ušetrené"] = max(0.0, plné - dekódovanie - orezanie["predspracovanie"])
+    finally:
+        if orezaný_súbor:
+            try:
+                os.unlink(orezaný_súbor)
+            except OSError:
+                pass
+
+    return segmenty, backend, orezanie, poznámka
+
+
+def popis_orezania(orezanie) -> str:
+    """Jednoriadkový súhrn orezania ticha pre CLI a GUI."""
+    if not orezanie:
+        return ""
+    if not orezanie.get("preskočené"):
+        return "Orezanie ticha: nič podstatné na preskočenie."
+    podiel = 100 * orezanie["preskočené"] / orezanie["dĺžka"] if orezanie["dĺžka"] else 0
+    if orezanie.get("ušetrené") is None:
+        return (
+            f"Orezanie ticha: preskočené {orezanie['preskočené']:.0f} s z {orezanie['dĺžka']:.0f} s "
+            f"({podiel:.0f} %), bez reči – transkripcia sa vynechala"
+        )
+    return (
+        f"Orezanie ticha: preskočené {orezanie['preskočené']:.0f} s z {orezanie['dĺžka']:.0f} s "
+        f"({podiel:.0f} %), ušetrené ~{orezanie['ušetrené']:.0f} s"
+    )
 
-    return text, backend
 
+def run_transcribe_cli(
+    vstup,
+    výstup,
+    model="tiny",
+    s_rečníkmi=False,
+    hf_token=None,
+    backend="auto",
+    formáty=("txt",),
+    orezať_ticho=False,
+    info_json=False,
+):
+    """Spustiteľné z príkazového riadku: zapíše transkript do súboru.
 
-def run_transcribe_cli(vstup, výstup, model="tiny", s_rečníkmi=False, hf_token=None, backend="auto", export_md=False):
-    """Spustiteľné z príkazového riadku: zapíše transkript do súboru."""
+    .txt ide presne do výstupu, ostatné formáty vedľa neho s rovnakým menom.
+    S info_json sa zapíše aj .info.json so štatistikou pre GUI.
+    """
     try:
         vstup_cesta = Path(vstup)
         výstup_cesta = Path(výstup)
@@ -277,7 +636,7 @@ def run_transcribe_cli(vstup, výstup, model="tiny", s_rečníkmi=False, hf_toke
             raise ValueError("Výstup nesmie byť rovnaký súbor ako vstup.")
         if výstup_cesta.suffix.lower() in {".m4a", ".mp3", ".wav"}:
             raise ValueError("Výstup musí byť textový súbor (.txt), nie audio súbor.")
-        text, použitý_backend = transkribuj(
+        segmenty, použitý_backend, orezanie, poznámka = transkribuj(
             vstup,
             model_názov=model,
             s_rečníkmi=s_rečníkmi,
@@ -285,17 +644,52 @@ def run_transcribe_cli(vstup, výstup, model="tiny", s_rečníkmi=False, hf_toke
             backend=backend,
             jazyk="auto",
             preložiť_do_en=False,
+            orezať_ticho=orezať_ticho,
         )
-        výstup_cesta.write_text(text, encoding="utf-8")
-        if export_md:
-            výstup_cesta.with_suffix(".md").write_text(text_do_markdown(text), encoding="utf-8")
+        cesty = cesty_exportu(výstup_cesta.with_suffix(""), formáty)
+        cesty["txt"] = výstup_cesta
+        if any(c.resolve() == výstup_cesta.resolve() for f, c in cesty.items() if f != "txt"):
+            raise ValueError("Výstup koliduje s iným exportovaným formátom.")
+        exportuj(segmenty, cesty, poznámka=poznámka)
+        if info_json:
+            info = {"backend": použitý_backend, "orezanie": orezanie}
+            výstup_cesta.with_suffix(".info.json").write_text(json.dumps(info, ensure_ascii=False), encoding="utf-8")
         print(f"Backend: {použitý_backend}")
+        if orezanie:
+            print(popis_orezania(orezanie))
         sys.exit(0)
     except Exception as e:
         Path(výstup).write_text(f"CHYBA: {e}", encoding="utf-8")
         sys.exit(1)
 
 
+def run_export_cli(segmenty_json, výstup=None, formáty=FORMÁTY):
+    """Znova vygeneruje formáty z uloženého .jsonl exportu, bez opätovnej transkripcie.
+
+    Bez výstupu sa súbory zapíšu vedľa .jsonl exportu; s výstupom ide .txt presne
+    doň a ostatné formáty vedľa neho.
+    """
+    try:
+        vstup_cesta = Path(segmenty_json)
+        if not vstup_cesta.exists():
+            raise FileNotFoundError(f"Súbor neexistuje: {segmenty_json}")
+        cesty = cesty_exportu(Path(výstup or vstup_cesta).with_suffix(""), formáty)
+        if výstup and "txt" in cesty:
+            cesty["txt"] = Path(výstup)
+        if "jsonl" in cesty and cesty["jsonl"].resolve() == vstup_cesta.resolve():
+            # Zdroj by sa prepísal počas čítania; regenerovať ho netreba
+            del cesty["jsonl"]
+        if any(c.resolve() == vstup_cesta.resolve() for c in cesty.values()):
+            raise ValueError("Výstup nesmie prepísať zdrojový .jsonl export.")
+        cesty = exportuj(načítaj_segmenty(vstup_cesta), cesty, poznámka=načítaj_poznámku(vstup_cesta))
+        for cesta in cesty.values():
+            print(cesta)
+        sys.exit(0)
+    except Exception as e:
+        print(f"CHYBA: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
 def main():
     try:
         import customtkinter as ctk  # type: ignore
@@ -319,6 +713,7 @@ def main():
     preklad_var = tk.StringVar(value="none")
     zapamätaj_token_var = tk.BooleanVar(value=True)
     rečníci_var = tk.BooleanVar(value=False)
+    ticho_var = tk.BooleanVar(value=False)
     config_data = load_config()
     token_var = tk.StringVar(value=config_data.get("hf_token") or os.environ.get("HF_TOKEN", ""))
 
@@ -341,7 +736,7 @@ def main():
     hero = ctk.CTkFrame(scroll, fg_color="transparent")
     hero.pack(fill="x", pady=(0, 20))
     ctk.CTkLabel(hero, text="Transkriptor", font=ctk.CTkFont(size=28, weight="bold")).pack(anchor="w")
-    ctk.CTkLabel(hero, text="Vyber audio, zvoľ nastavenia a stlač Spustiť. Výsledok uložíš ako .txt aj .md.", text_color=muted, font=ctk.CTkFont(size=13)).pack(anchor="w", pady=(4, 0))
+    ctk.CTkLabel(hero, text="Vyber audio, zvoľ nastavenia a stlač Spustiť. Výsledok sa uloží ako .txt, .md, .srt, .vtt aj .jsonl.", text_color=muted, font=ctk.CTkFont(size=13)).pack(anchor="w", pady=(4, 0))
 
     # --- Karta: Výber súboru ---
     file_card = ctk.CTkFrame(scroll, fg_color=card, corner_radius=14, border_width=1, border_color=border)
@@ -406,6 +801,8 @@ def main():
     row3.pack(fill="x", pady=6)
     rečníci_check = ctk.CTkCheckBox(row3, text="Rozpoznávať rečníkov (Hovoriaci 1, 2...)", variable=rečníci_var, corner_radius=8)
     rečníci_check.pack(side="left")
+    ticho_check = ctk.CTkCheckBox(row3, text="Preskočiť ticho (rýchlejšie)", variable=ticho_var, corner_radius=8)
+    ticho_check.pack(side="left", padx=(16, 0))
 
     # Riadok 4: Token
     row4 = ctk.CTkFrame(sett_inner, fg_color="transparent")
@@ -458,7 +855,7 @@ def main():
     # btn_zrušiť sa zobrazí len počas transkripcie (pack v spustiť_transkripciu)
 
     # Zdieľané údaje pre progress
-    progress_data = {"start": 0.0, "odhad_sek": 60.0, "dokončené": False, "timer_id": None, "process": None, "output_path": None, "on_done": None}
+    progress_data = {"start": 0.0, "odhad_sek": 60.0, "približný": False, "dokončené": False, "timer_id": None, "process": None, "output_path": None, "on_done": None}
 
     def formátuj_čas(sekundy):
         if sekundy < 60:
@@ -501,7 +898,10 @@ def main():
         zostáva = max(0, odhad - elapsed)
 
         progress.set(pct / 100)
-        if elapsed > odhad:
+        if progress_data["približný"]:
+            # Koľko ticha sa preskočí, vie až subprocess; odhad ráta s celým audiom
+            stav.set(f"Prebieha transkripcia... {pct}% (orientačne, ticho sa preskakuje – {formátuj_čas(elapsed)} uplynulo)")
+        elif elapsed > odhad:
             stav.set(f"Spracováva sa... {pct}% (odhad prekročený – {formátuj_čas(elapsed)} uplynulo)")
         else:
             stav.set(f"Prebieha transkripcia... {pct}% (~{formátuj_čas(zostáva)} zostáva)")
@@ -539,6 +939,7 @@ def main():
         jazyk = jazyk_var.get().strip() or "auto"
         preložiť_do_en = preklad_var.get() == "english"
         s_rečníkmi = rečníci_var.get()
+        orezať_ticho = ticho_var.get()
         hf_token = token_var.get().strip() or None
         if zapamätaj_token_var.get():
             cfg = load_config()
@@ -563,6 +964,7 @@ def main():
         if s_rečníkmi:
             odhad = int(odhad * 2)
         progress_data["odhad_sek"] = odhad
+        progress_data["približný"] = orezať_ticho
 
         progress.set(0)
         progress.pack(fill="x", pady=(0, 12))
@@ -583,6 +985,8 @@ def main():
             cmd = [sys.executable, str(script_path), "--transcribe", súbor, out_path, model, "--backend", backend]
         if s_rečníkmi:
             cmd.append("--rečníci")
+        if orezať_ticho:
+            cmd.append("--bez-ticha")
         env = os.environ.copy()
         if hf_token:
             env["HF_TOKEN"] = hf_token
@@ -608,20 +1012,45 @@ def main():
             progress.pack_forget()
             btn_zrušiť.pack_forget()
             btn_transkribuj.configure(state="normal")
-            if chyba:
-                stav.set("Chyba!" if chyba != "Zrušené" else "Zrušené")
-                if chyba == "Zrušené":
-                    messagebox.showinfo("Zrušené", "Transkripcia bola zrušená.")
-                else:
-                    messagebox.showerror("Chyba", chyba)
-            else:
+            info_cesta = Path(out_path).with_suffix(".info.json")
+            segmenty_cesta = Path(out_path).with_suffix(".jsonl")
+            try:
+                if chyba:
+                    stav.set("Chyba!" if chyba != "Zrušené" else "Zrušené")
+                    if chyba == "Zrušené":
+                        messagebox.showinfo("Zrušené", "Transkripcia bola zrušená.")
+                    else:
+                        messagebox.showerror("Chyba", chyba)
+                    return
                 text.insert("end", výsledok)
                 base = Path(súbor).with_suffix("")
-                txt_cesta = base.with_suffix(".txt")
-                md_cesta = base.with_suffix(".md")
-                txt_cesta.write_text(výsledok, encoding="utf-8")
-                md_cesta.write_text(text_do_markdown(výsledok), encoding="utf-8")
-                messagebox.showinfo("Hotovo", f"Transkript uložený:\n• {txt_cesta.name}\n• {md_cesta.name}\n\nPriečinok: {base.parent}")
+                súhrn = ""
+                if info_cesta.exists():
+                    try:
+                        info = json.loads(info_cesta.read_text(encoding="utf-8"))
+                        súhrn = popis_orezania(info.get("orezanie"))
+                    except Exception:
+                        súhrn = ""
+                # Všetky formáty sa generujú z uložených segmentov, nie z textu
+                try:
+                    cesty = exportuj(
+                        načítaj_segmenty(segmenty_cesta),
+                        cesty_exportu(base),
+                        poznámka=načítaj_poznámku(segmenty_cesta),
+                    )
+                except Exception as e:
+                    stav.set("Chyba!")
+                    messagebox.showerror("Chyba", f"Transkript sa nepodarilo uložiť: {e}")
+                    return
+                if súhrn:
+                    stav.set(súhrn)
+                    súhrn = f"\n\n{súhrn}"
+                zoznam = "\n".join(f"• {c.name}" for c in cesty.values())
+                messagebox.showinfo("Hotovo", f"Transkript uložený:\n{zoznam}\n\nPriečinok: {base.parent}{súhrn}")
+            finally:
+                # Dočasné súbory subprocessu sa upracú pri každom konci behu
+                for cesta in (Path(out_path), info_cesta, segmenty_cesta):
+                    cesta.unlink(missing_ok=True)
 
         progress_data["on_done"] = dokončené
 
@@ -640,8 +1069,15 @@ if __name__ == "__main__":
     parser.add_argument("--rečníci", action="store_true", help="Zapne rozpoznávanie rečníkov (vyžaduje HF token)")
     parser.add_argument("--hf-token", default=os.environ.get("HF_TOKEN"), help="HuggingFace token pre diarizáciu")
     parser.add_argument("--backend", default="auto", choices=["auto", "mlx", "mps", "cuda", "cpu"], help="Výpočtový backend")
+    parser.add_argument("--formáty", default=",".join(FORMÁTY), help="Výstupné formáty oddelené čiarkou: txt,md,srt,vtt,jsonl (pri --input sa --output zapíše vždy)")
+    parser.add_argument("--zo-segmentov", help="Znova vygeneruje formáty z uloženého .jsonl exportu (bez transkripcie)")
+    parser.add_argument("--bez-ticha", action="store_true", help="Pred transkripciou preskočí ticho (rýchlejšie, menej halucinácií)")
 
     args, zvyšok = parser.parse_known_args()
+    formáty = tuple(f.strip().lstrip(".").lower() for f in args.formáty.split(",") if f.strip())
+    neznáme = set(formáty) - set(FORMÁTY)
+    if neznáme:
+        parser.error(f"Neznámy formát: {', '.join(sorted(neznáme))}")
 
     # Legacy interné volanie z GUI:
     # python transcript.py --transcribe <vstup> <výstup> <model> [--rečníci] [--backend X]
@@ -661,8 +1097,12 @@ if __name__ == "__main__":
             s_rečníkmi=s_rečníkmi,
             hf_token=args.hf_token,
             backend=args.backend,
-            export_md=False,
+            formáty=("txt", "jsonl"),
+            orezať_ticho=args.bez_ticha,
+            info_json=True,
         )
+    elif args.zo_segmentov:
+        run_export_cli(args.zo_segmentov, args.output, formáty=formáty)
     elif args.input and args.output:
         run_transcribe_cli(
             args.input,
@@ -671,7 +1111,8 @@ if __name__ == "__main__":
             s_rečníkmi=args.rečníci,
             hf_token=args.hf_token,
             backend=args.backend,
-            export_md=True,
+            formáty=formáty,
+            orezať_ticho=args.bez_ticha,
         )
     else:
         try: